@@ -1,8 +1,22 @@
+import multiprocessing
+import os
 import random
-from typing import List, Dict, Optional, Union, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Dict, Optional, Union, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ModuleNotFoundError:       # pragma: no cover
+    NUMPY_AVAILABLE = False
 
 # ────────────────────  core model  ────────────────────
 class Ship:
+    __slots__ = ("initiative", "hull", "computer", "shield",
+                 "missiles", "cannons")
+
     def __init__(
         self,
         initiative: int,
@@ -19,56 +33,262 @@ class Ship:
         self.missiles = missiles       # each entry = fixed damage of one shot
         self.cannons = cannons         # idem
 
-    # ── helpers ────────────────────────────────────────
-    def _destroyed(self) -> bool:
-        return self.hull <= 0
-
-    def _take(self, dmg: int) -> None:
-        self.hull -= dmg
 
-    def _roll(self) -> Union[str, int]:
-        """Uniform pick from six outcomes."""
-        return random.choice(["No damage", 2, 3, 4, 5, "Full hit"])
+def _fire(weapon: List[int], computer: int, target_shield: int,
+          target_hp: int, randbelow: Callable[[int], int]) -> int:
+    """Fire every shot of *weapon*; return the target's remaining hull.
 
-    def _hit(self, roll: Union[str, int], target_shield: int) -> bool:
-        if roll == "No damage":
-            return False
-        if roll == "Full hit":
-            return True
-        return roll + self.computer - target_shield >= 6
+    `randbelow` is the caller's bound `Random._randbelow`, which skips the
+    `randrange` argument checks on every shot.
+    """
+    # die face 0 → "No damage", 5 → "Full hit", else value = face + 1
+    for dmg in weapon:
+        r = randbelow(6)
+        if r == 0:
+            continue
+        if r == 5 or r + 1 + computer - target_shield >= 6:
+            target_hp -= dmg
+            if target_hp <= 0:
+                break
+    return target_hp
 
-    def _fire(self, target: "Ship", weapon: List[int]) -> None:
-        for dmg in weapon:
-            if self._hit(self._roll(), target.shield):
-                target._take(dmg)
-                if target._destroyed():
-                    break
 
+def _simulate_once(a: Ship, b: Ship, rng: random.Random) -> int:
+    """Run one battle; return 1 if A wins, -1 if B wins, 0 for draw.
 
-def _simulate_once(a: Ship, b: Ship) -> int:
-    """Run one battle; return 1 if A wins, -1 if B wins, 0 for draw."""
+    Ships are only read: hulls are tracked in locals, so the same pair
+    can be replayed for every trial.  Dice come from `rng`, never from the
+    shared module-level generator.
+    """
+    randbelow = rng._randbelow
     first, second = (a, b) if a.initiative > b.initiative else (b, a)
+    sign = 1 if first is a else -1
+    f_hp, f_comp, f_sh = first.hull, first.computer, first.shield
+    s_hp, s_comp, s_sh = second.hull, second.computer, second.shield
 
-    # missile phase
-    if first.missiles:
-        first._fire(second, first.missiles)
-        if second._destroyed():
-            return 1 if first is a else -1
-    if second.missiles:
-        second._fire(first, second.missiles)
-        if first._destroyed():
-            return 1 if second is a else -1
+    # a side that starts wrecked never fires, not even its missiles
+    if f_hp <= 0 or s_hp <= 0:
+        if f_hp <= 0 and s_hp <= 0:
+            return 0
+        return sign if f_hp > 0 else -sign
+
+    # missile phase – skipped outright when neither side carries any
+    f_miss, s_miss = first.missiles, second.missiles
+    if f_miss or s_miss:
+        if f_miss:
+            s_hp = _fire(f_miss, f_comp, s_sh, s_hp, randbelow)
+            if s_hp <= 0:
+                return sign
+        if s_miss:
+            f_hp = _fire(s_miss, s_comp, f_sh, f_hp, randbelow)
+            if f_hp <= 0:
+                return -sign
 
     # cannon phase
-    while not a._destroyed() and not b._destroyed():
-        first._fire(second, first.cannons)
-        if second._destroyed():
-            break
-        second._fire(first, second.cannons)
+    f_can, s_can = first.cannons, second.cannons
+    while True:
+        s_hp = _fire(f_can, f_comp, s_sh, s_hp, randbelow)
+        if s_hp <= 0:
+            return sign
+        f_hp = _fire(s_can, s_comp, f_sh, f_hp, randbelow)
+        if f_hp <= 0:
+            return -sign
+
+
+# Pure-Python runs at least this long are split across worker processes.
+_PARALLEL_MIN_SIMS = 100_000
+
+
+def _count_wins(
+    spec_a: Dict[str, Union[int, List[int]]],
+    spec_b: Dict[str, Union[int, List[int]]],
+    n: int,
+    rng: random.Random,
+) -> int:
+    """Run `n` pure-Python battles drawing from `rng`; return A's wins."""
+    # _simulate_once never mutates its ships, so one pair serves every trial
+    ship_a = Ship(**spec_a)
+    ship_b = Ship(**spec_b)
+    wins = 0
+    for _ in range(n):
+        if _simulate_once(ship_a, ship_b, rng) == 1:
+            wins += 1
+    return wins
+
+
+def _worker(args: Tuple[int, Optional[int], dict, dict]) -> int:
+    """Process-pool entry point: `_count_wins` on a freshly seeded RNG."""
+    n, seed, spec_a, spec_b = args
+    return _count_wins(spec_a, spec_b, n, random.Random(seed))
+
+
+# ────────────────────  vectorised batch  ───────────────
+def _hit_probability(computer: int, target_shield: int) -> float:
+    """Chance that one shot hits: hitting die faces out of six."""
+    faces = sum(
+        1 for r in range(1, 6) if r == 5 or r + 1 + computer - target_shield >= 6
+    )
+    return faces / 6
+
+
+def _min_hit_face(computer: int, target_shield: int) -> int:
+    """Lowest die face (0 … 5) that hits; face 5 always does, 0 never."""
+    return max(1, min(5, 5 - computer + target_shield))
+
+
+# Same-damage groups at least this large use one Binomial draw per trial.
+_BINOMIAL_MIN_SHOTS = 8
+
+
+def _fire_volley_batch(
+    hp: "np.ndarray",
+    active: "np.ndarray",
+    weapon: List[int],
+    need: int,
+    rng: "np.random.Generator",
+) -> None:
+    """Fire *weapon* once in every trial; damage lands on `hp` where `active`.
+
+    Shots after the target dies cannot change the outcome, so a volley is
+    just its damage total, and shots of equal damage are interchangeable.
+    A damage value fired by many shots therefore costs one
+    Binomial(count, p) draw; the rest roll int8 dice, which NumPy
+    generates several times faster than Binomial variates.  `need` is the
+    lowest die face that hits.
+    """
+    if not weapon:
+        return
+    p = (6 - need) / 6
+    dmg = np.zeros(hp.size, dtype=hp.dtype)
+    few = []
+    for d, k in Counter(weapon).items():
+        if k >= _BINOMIAL_MIN_SHOTS:
+            dmg += d * rng.binomial(k, p, size=hp.size).astype(hp.dtype)
+        else:
+            few += [d] * k
+    if few:
+        rolls = rng.integers(0, 6, size=(hp.size, len(few)), dtype=np.int8)
+        dmg += (rolls >= need) @ np.asarray(few, dtype=hp.dtype)
+    np.subtract(hp, dmg, out=hp, where=active)
+
 
-    if a._destroyed() and b._destroyed():
-        return 0
-    return 1 if not a._destroyed() else -1
+def _simulate_batch(
+    spec_a: Dict[str, Union[int, List[int]]],
+    spec_b: Dict[str, Union[int, List[int]]],
+    n: int,
+    rng: "np.random.Generator",
+) -> int:
+    """Run `n` battles in lockstep as hull arrays; return how many A wins."""
+    # int8 packs 64 trials per cache line; widen only as far as a hull
+    # minus one full volley needs
+    volley = max(sum(spec[key]) for spec in (spec_a, spec_b)
+                 for key in ("missiles", "cannons"))
+    span = max(spec_a["hull"], spec_b["hull"]) + volley
+    dtype = next(t for t in (np.int8, np.int16, np.int32, np.int64)
+                 if span <= np.iinfo(t).max)
+    a_hp = np.full(n, spec_a["hull"], dtype=dtype)
+    b_hp = np.full(n, spec_b["hull"], dtype=dtype)
+    a_first = spec_a["initiative"] > spec_b["initiative"]
+    first, second = (spec_a, spec_b) if a_first else (spec_b, spec_a)
+    first_hp, second_hp = (a_hp, b_hp) if a_first else (b_hp, a_hp)
+
+    # hit threshold is fixed per side for the whole battle
+    need_first = _min_hit_face(first["computer"], second["shield"])
+    need_second = _min_hit_face(second["computer"], first["shield"])
+
+    def exchange(key: str) -> None:
+        _fire_volley_batch(second_hp, (first_hp > 0) & (second_hp > 0),
+                           first[key], need_first, rng)
+        _fire_volley_batch(first_hp, (first_hp > 0) & (second_hp > 0),
+                           second[key], need_second, rng)
+
+    # missile phase
+    exchange("missiles")
+
+    # cannon phase – a handful of rounds until every trial is decided
+    while np.any((a_hp > 0) & (b_hp > 0)):
+        exchange("cannons")
+
+    return int(np.count_nonzero((a_hp > 0) & (b_hp <= 0)))
+
+
+# ────────────────────  exact solver  ───────────────────
+# Battles whose hull × weapon count is at most this are solved exactly.
+_EXACT_LIMIT = 64
+
+
+def _damage_distribution(weapon: List[int], p: float) -> List[float]:
+    """P(volley deals exactly d damage) for d = 0 … sum(weapon).
+
+    Product of the per-shot generating functions (1 - p) + p·x^dmg.
+    """
+    dist = [1.0]
+    for dmg in weapon:
+        nxt = [0.0] * (len(dist) + dmg)
+        for d, q in enumerate(dist):
+            nxt[d] += q * (1 - p)
+            nxt[d + dmg] += q * p
+        dist = nxt
+    return dist
+
+
+def exact_win_probability(
+    spec_a: Dict[str, Union[int, List[int]]],
+    spec_b: Dict[str, Union[int, List[int]]],
+) -> float:
+    """
+    P(Ship A wins) computed by dynamic programming – no Monte-Carlo noise.
+
+    The cannon phase is a Markov chain on (first_hp, second_hp).  Every
+    transition lowers at least one hull except the "both miss" self-loop,
+    so states are solved in increasing hull order and the self-loop is
+    divided out.  A stalemate (neither side can ever hit) counts as a loss.
+    """
+    a_first = spec_a["initiative"] > spec_b["initiative"]
+    first, second = (spec_a, spec_b) if a_first else (spec_b, spec_a)
+    w_first = 1.0 if a_first else 0.0        # value when `first` wins
+    w_second = 1.0 - w_first
+
+    p_first = _hit_probability(first["computer"], second["shield"])
+    p_second = _hit_probability(second["computer"], first["shield"])
+    can_f = _damage_distribution(first["cannons"], p_first)
+    can_s = _damage_distribution(second["cannons"], p_second)
+
+    f0, s0 = first["hull"], second["hull"]
+    # a side that starts wrecked never fires; both wrecked is a draw
+    if f0 <= 0 or s0 <= 0:
+        return 1.0 if spec_a["hull"] > 0 and spec_b["hull"] <= 0 else 0.0
+    # win[f][s]: P(A wins) entering a cannon round with hulls (f, s)
+    win = [[0.0] * (s0 + 1) for _ in range(f0 + 1)]
+    stay = can_f[0] * can_s[0]
+    for f in range(1, f0 + 1):
+        for s in range(1, s0 + 1):
+            acc = 0.0
+            for x, px in enumerate(can_f):
+                if s - x <= 0:
+                    acc += px * w_first
+                    continue
+                for y, py in enumerate(can_s):
+                    if f - y <= 0:
+                        acc += px * py * w_second
+                    elif x or y:
+                        acc += px * py * win[f - y][s - x]
+            win[f][s] = acc / (1 - stay) if stay < 1 else acc
+
+    # missile phase: one volley each, then hand over to the cannon chain
+    mis_f = _damage_distribution(first["missiles"], p_first)
+    mis_s = _damage_distribution(second["missiles"], p_second)
+    total = 0.0
+    for x, px in enumerate(mis_f):
+        if s0 - x <= 0:
+            total += px * w_first
+            continue
+        for y, py in enumerate(mis_s):
+            if f0 - y <= 0:
+                total += px * py * w_second
+            else:
+                total += px * py * win[f0 - y][s0 - x]
+    return total
 
 
 # ────────────────────  public API  ─────────────────────
@@ -77,31 +297,54 @@ def win_probability(
     spec_b: Dict[str, Union[int, List[int]]],
     simulations: int = 100_000,
     seed: Optional[int] = None,
+    exact: bool = True,
 ) -> float:
     """
     Estimate P(Ship A wins) by running `simulations` independent battles.
 
+    Small battles (hull × weapon count ≤ 64) are answered exactly by
+    `exact_win_probability` instead, unless `exact` is False.
+
     Parameters
     ----------
     spec_a, spec_b : mapping with keys
         initiative, hull, computer, shield, missiles, cannons
     simulations    : how many Monte-Carlo trials (default 100 000)
     seed           : optional RNG seed for reproducibility
+    exact          : allow the exact DP fast path (default True)
 
     Returns
     -------
     float   probability that Ship A wins
     """
-    if seed is not None:
-        random.seed(seed)
+    if exact:
+        hull = max(spec_a["hull"], spec_b["hull"])
+        weapons = sum(len(s["missiles"]) + len(s["cannons"])
+                      for s in (spec_a, spec_b))
+        if hull * weapons <= _EXACT_LIMIT:
+            return exact_win_probability(spec_a, spec_b)
 
-    wins = 0
-    for _ in range(simulations):
-        ship_a = Ship(**spec_a)
-        ship_b = Ship(**spec_b)
-        outcome = _simulate_once(ship_a, ship_b)
-        wins += 1 if outcome == 1 else 0
-    return wins / simulations
+    if NUMPY_AVAILABLE:
+        rng = np.random.default_rng(seed)
+        return _simulate_batch(spec_a, spec_b, simulations, rng) / simulations
+
+    # pure-Python loop: fan large runs out over every core
+    workers = os.cpu_count() or 1
+    if workers > 1 and simulations >= _PARALLEL_MIN_SIMS:
+        # one child seed per worker, drawn from a private stream of `seed`
+        seeder = random.Random(seed)
+        chunks = [(simulations // workers + (i < simulations % workers),
+                   None if seed is None else seeder.getrandbits(64),
+                   spec_a, spec_b)
+                  for i in range(workers)]
+        # spawn, not fork: forking a process that already runs native
+        # worker threads (e.g. Numba's) can deadlock the children
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=ctx) as ex:
+            return sum(ex.map(_worker, chunks)) / simulations
+
+    return _count_wins(spec_a, spec_b, simulations,
+                       random.Random(seed)) / simulations
 
 
 # ────────────────────  example usage  ──────────────────
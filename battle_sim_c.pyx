@@ -0,0 +1,176 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+battle_sim_c.pyx
+================
+
+Ahead-of-time compiled core for `battle_sim_numba.win_probability`.
+
+Same rules as the Numba kernel, but no JIT warm-up: trials run in a
+`nogil` `prange` loop, each fixed-size chunk of trials drawing from its own
+xoshiro256** stream seeded by splitmix64(seed, chunk).  Chunking (not
+threads) owns the streams, so results do not depend on the thread count.
+
+Build in place with
+
+    python setup.py build_ext --inplace
+"""
+
+from cython.parallel cimport prange
+from libc.stdint cimport uint64_t
+
+# trials per RNG stream – fixed so the answer is independent of threads
+cdef enum:
+    CHUNK = 4096
+
+
+cdef struct state_t:
+    uint64_t s[4]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# RNG: splitmix64 for seeding, xoshiro256** for the dice
+# ──────────────────────────────────────────────────────────────────────────
+
+cdef inline uint64_t _splitmix64(uint64_t* x) noexcept nogil:
+    x[0] += <uint64_t>0x9E3779B97F4A7C15
+    cdef uint64_t z = x[0]
+    z = (z ^ (z >> 30)) * <uint64_t>0xBF58476D1CE4E5B9
+    z = (z ^ (z >> 27)) * <uint64_t>0x94D049BB133111EB
+    return z ^ (z >> 31)
+
+
+cdef inline uint64_t _rotl(uint64_t x, int k) noexcept nogil:
+    return (x << k) | (x >> (64 - k))
+
+
+cdef inline uint64_t _next(state_t* st) noexcept nogil:
+    cdef uint64_t* s = st.s
+    cdef uint64_t result = _rotl(s[1] * 5, 7) * 9
+    cdef uint64_t t = s[1] << 17
+    s[2] ^= s[0]
+    s[3] ^= s[1]
+    s[1] ^= s[2]
+    s[0] ^= s[3]
+    s[2] ^= t
+    s[3] = _rotl(s[3], 45)
+    return result
+
+
+cdef inline state_t _seed(uint64_t seed, uint64_t stream) noexcept nogil:
+    cdef state_t st
+    cdef uint64_t x = seed ^ _splitmix64(&stream)
+    cdef int i
+    for i in range(4):
+        st.s[i] = _splitmix64(&x)
+    return st
+
+
+cdef inline int _roll(state_t* st) noexcept nogil:
+    """Die face 0 … 5 via Lemire's multiply-shift on the top 32 bits."""
+    return <int>(((_next(st) >> 32) * 6) >> 32)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Battle
+# ──────────────────────────────────────────────────────────────────────────
+
+cdef inline int _hit_mask(int comp, int shield) noexcept nogil:
+    """Bit r set ⇔ die face r hits (0 = "No damage", 5 = "Full hit")."""
+    cdef int mask = 1 << 5
+    cdef int r
+    for r in range(1, 5):
+        if r + 1 + comp - shield >= 6:
+            mask |= 1 << r
+    return mask
+
+
+cdef struct weapon_t:
+    const int* dmg
+    Py_ssize_t n
+
+
+cdef inline int _fire(weapon_t w, int mask, int enemy_hp,
+                      state_t* st) noexcept nogil:
+    cdef const int* dmg_arr = w.dmg
+    cdef Py_ssize_t i
+    for i in range(w.n):
+        if (mask >> _roll(st)) & 1:
+            enemy_hp -= dmg_arr[i]
+            if enemy_hp <= 0:
+                return enemy_hp
+    return enemy_hp
+
+
+cdef int _battle_once(bint a_first,
+                      int a_hp, int a_mask,
+                      weapon_t a_miss, weapon_t a_can,
+                      int b_hp, int b_mask,
+                      weapon_t b_miss, weapon_t b_can,
+                      state_t* st) noexcept nogil:
+    """1 → A wins, 0 → B wins.  `*_mask` is the shooter's hit mask."""
+    if a_first:
+        b_hp = _fire(a_miss, a_mask, b_hp, st)
+        if b_hp <= 0:
+            return 1
+        a_hp = _fire(b_miss, b_mask, a_hp, st)
+        if a_hp <= 0:
+            return 0
+        while True:
+            b_hp = _fire(a_can, a_mask, b_hp, st)
+            if b_hp <= 0:
+                return 1
+            a_hp = _fire(b_can, b_mask, a_hp, st)
+            if a_hp <= 0:
+                return 0
+    else:
+        a_hp = _fire(b_miss, b_mask, a_hp, st)
+        if a_hp <= 0:
+            return 0
+        b_hp = _fire(a_miss, a_mask, b_hp, st)
+        if b_hp <= 0:
+            return 1
+        while True:
+            a_hp = _fire(b_can, b_mask, a_hp, st)
+            if a_hp <= 0:
+                return 0
+            b_hp = _fire(a_can, a_mask, b_hp, st)
+            if b_hp <= 0:
+                return 1
+
+
+cdef weapon_t _weapon(const int[::1] arr):
+    """Raw view of a damage list – no memoryview refcounting in the loop."""
+    cdef weapon_t w
+    w.n = arr.shape[0]
+    w.dmg = &arr[0] if w.n else NULL
+    return w
+
+
+def batch_simulate(Py_ssize_t n,
+                   int a_init, int a_hp, int a_comp, int a_shield,
+                   const int[::1] a_miss, const int[::1] a_can,
+                   int b_init, int b_hp, int b_comp, int b_shield,
+                   const int[::1] b_miss, const int[::1] b_can,
+                   uint64_t seed):
+    """Run `n` duels across threads; return how many A wins."""
+    cdef weapon_t am = _weapon(a_miss), ac = _weapon(a_can)
+    cdef weapon_t bm = _weapon(b_miss), bc = _weapon(b_can)
+    cdef bint a_first = a_init > b_init
+    cdef int a_mask = _hit_mask(a_comp, b_shield)
+    cdef int b_mask = _hit_mask(b_comp, a_shield)
+    cdef Py_ssize_t n_chunks = (n + CHUNK - 1) // CHUNK
+    cdef Py_ssize_t c, i, stop
+    cdef long wins = 0
+    cdef long local
+    cdef state_t st
+
+    for c in prange(n_chunks, nogil=True, schedule="static"):
+        st = _seed(seed, <uint64_t>c)
+        stop = min(CHUNK, n - c * CHUNK)
+        local = 0
+        for i in range(stop):
+            local = local + _battle_once(a_first,
+                                         a_hp, a_mask, am, ac,
+                                         b_hp, b_mask, bm, bc, &st)
+        wins += local
+    return wins
@@ -5,7 +5,10 @@ fast_battle.py
 High-performance Monte-Carlo simulator for the Eclipse-style ship duel.
 
 • Pure-Python wrapper  – always available
+• Cython core         – used when `battle_sim_c` has been built
+                        (`python setup.py build_ext --inplace`); no JIT warm-up
 • Numba JIT core      – auto-enabled when numba is installed
+• Numba CUDA kernel   – used for ≥ 1 000 000 simulations when a GPU is present
 • Automatically falls back to the slower (but still vectorised) pure-Python
   engine if numba is missing or you’re on PyPy, etc.
 
@@ -28,6 +31,7 @@ Ship specification dict
 """
 
 from __future__ import annotations
+import functools
 import os
 import math
 import random
@@ -41,6 +45,49 @@ try:
 except ModuleNotFoundError:       # pragma: no cover
     NUMBA_AVAILABLE = False
 
+try:
+    from numba import cuda
+    from numba.cuda.random import (create_xoroshiro128p_states,
+                                   xoroshiro128p_uniform_float32)
+
+    CUDA_AVAILABLE = cuda.is_available()
+except (ModuleNotFoundError, ImportError):   # pragma: no cover
+    CUDA_AVAILABLE = False
+
+try:
+    import numpy as np
+    import battle_sim_c
+
+    CYTHON_AVAILABLE = True
+except ModuleNotFoundError:       # pragma: no cover
+    CYTHON_AVAILABLE = False
+
+# ──────────────────────────────────────────────────────────────────────────
+# Shared helpers – weapon-list buffers for the compiled cores
+# ──────────────────────────────────────────────────────────────────────────
+
+if NUMBA_AVAILABLE or CYTHON_AVAILABLE:
+    @functools.lru_cache(maxsize=64)
+    def _to_arr(key: tuple, dtype=np.int8):
+        """Read-only 1-D array for a damage list, reused across calls.
+
+        Keyed on the list's contents (as a tuple), so repeated
+        `win_probability` calls on the same specs allocate nothing and
+        Numba sees the same array type every time.
+        """
+        arr = np.asarray(key, dtype=dtype)
+        arr.flags.writeable = False
+        return arr
+
+    # shared zero-length buffers: an empty weapon list never allocates
+    _EMPTY = {dt: _to_arr((), dt) for dt in (np.int8, np.int32, np.int64)}
+
+    def _weapon_arr(weapon, dtype=np.int8):
+        """`_to_arr` for a spec list; empty lists skip the tuple + cache."""
+        if not weapon:
+            return _EMPTY[dtype]
+        return _to_arr(tuple(weapon), dtype)
+
 # ──────────────────────────────────────────────────────────────────────────
 # Internal helpers – compiled version
 # ──────────────────────────────────────────────────────────────────────────
@@ -51,96 +98,357 @@ if NUMBA_AVAILABLE:
     #   -1 → “No damage”     (always miss)
     #   -2 → “Full hit”      (always hit)
 
+    # trials per RNG stream – fixed so results do not depend on thread count
+    _CHUNK = 4096
+
+    # ── inline xoshiro256** – state is a uint64[4] owned by one chunk ──
+    # (seeded outside the JIT by `_chunk_states` via SeedSequence.spawn)
+    @nb.njit(inline="always")
+    def _rotl(x, k):
+        return (x << np.uint64(k)) | (x >> np.uint64(64 - k))
+
+    @nb.njit(inline="always")
+    def _xoshiro_next(s) -> int:
+        """Advance `s` in place; return the next 64-bit output."""
+        result = _rotl(s[1] * np.uint64(5), 7) * np.uint64(9)
+        t = s[1] << np.uint64(17)
+        s[2] ^= s[0]
+        s[3] ^= s[1]
+        s[1] ^= s[2]
+        s[0] ^= s[3]
+        s[2] ^= t
+        s[3] = _rotl(s[3], 45)
+        return result
+
+    @nb.njit(inline="always")
+    def _roll(s) -> int:
+        """Die face 0 … 5: Lemire multiply-shift, no modulo."""
+        return int(((_xoshiro_next(s) >> np.uint64(32)) * np.uint64(6))
+                   >> np.uint64(32))
+
+    @nb.njit(inline="always")
+    def _binomial(s, k, p) -> int:
+        """Binomial(k, p) by CDF inversion of one uniform (k is small)."""
+        u = (_xoshiro_next(s) >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+        q = 1.0 - p
+        pmf = 1.0
+        for _ in range(k):               # q**k without pow → no __powidf2
+            pmf *= q
+        cdf = pmf
+        j = 0
+        while u >= cdf and j < k:
+            pmf *= (k - j) / (j + 1) * p / q
+            j += 1
+            cdf += pmf
+        return j
+
     @nb.njit(inline="always", fastmath=True)
-    def _roll_hit(comp: int, shield: int) -> bool:
-        """Return True if a single shot hits."""
-        r = np.random.randint(0, 6)        # 0 … 5
-        val = _VALUES[r]
-        if val == -1:                      # "No damage"
-            return False
-        if val == -2:                      # "Full hit"
-            return True
-        return val + comp - shield >= 6
+    def _hit_mask(comp: int, shield: int) -> int:
+        """Bit r set ⇔ die face r hits for this (comp, shield) pair."""
+        mask = 0
+        for r in range(6):
+            val = _VALUES[r]
+            if val == -2 or (val != -1 and val + comp - shield >= 6):
+                mask |= 1 << r
+        return mask
 
     @nb.njit(inline="always", fastmath=True)
-    def _fire_sequence(dmg_arr,  # 1-D int32 array
+    def _fire_sequence(dmg_arr,  # 1-D int8/int64 array
                        comp: int,
                        enemy_shield: int,
-                       enemy_hp: int) -> int:
+                       enemy_hp: int,
+                       s) -> int:
         """Apply an entire missile/cannon list; return new enemy_hp (≥ 0)."""
+        mask = _hit_mask(comp, enemy_shield)
         for dmg in dmg_arr:
-            if _roll_hit(comp, enemy_shield):
+            r = _roll(s)                       # 0 … 5
+            if (mask >> r) & 1:
                 enemy_hp -= dmg
                 if enemy_hp <= 0:
                     return enemy_hp
         return enemy_hp
 
+    @nb.njit(inline="always", fastmath=True)
+    def _fire_missiles(dmg_vals,  # 1-D int8/int64 array, distinct damages
+                       counts,    # 1-D int64 array, missiles per damage
+                       comp: int,
+                       enemy_shield: int,
+                       enemy_hp: int,
+                       s) -> int:
+        """Single missile volley: one Binomial draw per distinct damage."""
+        mask = _hit_mask(comp, enemy_shield)
+        faces = 0
+        for r in range(6):
+            faces += (mask >> r) & 1
+        p = faces / 6.0
+        for i in range(dmg_vals.size):
+            enemy_hp -= dmg_vals[i] * _binomial(s, counts[i], p)
+        return enemy_hp
+
     @nb.njit(fastmath=True)
-    def _battle_once(a_init, a_hp0, a_comp, a_shield,
-                     a_miss, a_can,
-                     b_init, b_hp0, b_comp, b_shield,
-                     b_miss, b_can) -> int:
+    def _first_wins(f_hp, f_comp, f_shield, f_miss, f_miss_n, f_can,
+                    s_hp, s_comp, s_shield, s_miss, s_miss_n, s_can,
+                    s) -> int:
         """
-        Simulate one duel.
+        Simulate one duel from the point of view of the side that fires
+        first (`f_*`) against the side that fires second (`s_*`), so the
+        round loop never re-checks initiative.  Missiles arrive grouped:
+        `*_miss` holds the distinct damage values, `*_miss_n` how many
+        missiles deal each.  `s` is the caller's xoshiro256** state,
+        advanced in place.
 
         Returns
         -------
-        1  → A wins
-        0  → B wins   (draws are impossible with current rules)
+        1  → first-firing side wins
+        0  → second-firing side wins   (draws are impossible)
         """
-        a_hp = a_hp0
-        b_hp = b_hp0
-
-        # who fires first
-        a_first = a_init > b_init
-
-        # ---------- Missile phase ----------
-        if a_first:
-            b_hp = _fire_sequence(a_miss, a_comp, b_shield, b_hp)
-            if b_hp <= 0:
+        # ---------- Missile phase (skipped if nobody has missiles) ----------
+        if f_miss.size or s_miss.size:
+            s_hp = _fire_missiles(f_miss, f_miss_n, f_comp, s_shield, s_hp, s)
+            if s_hp <= 0:
                 return 1
-            a_hp = _fire_sequence(b_miss, b_comp, a_shield, a_hp)
-            if a_hp <= 0:
-                return 0
-        else:
-            a_hp = _fire_sequence(b_miss, b_comp, a_shield, a_hp)
-            if a_hp <= 0:
+            f_hp = _fire_missiles(s_miss, s_miss_n, s_comp, f_shield, f_hp, s)
+            if f_hp <= 0:
                 return 0
-            b_hp = _fire_sequence(a_miss, a_comp, b_shield, b_hp)
-            if b_hp <= 0:
-                return 1
+        # a side that starts wrecked never reaches its cannons
+        if s_hp <= 0:
+            return 1
+        if f_hp <= 0:
+            return 0
 
         # ---------- Cannon phase ----------
         while True:
-            # A fires (if has initiative) or B fires depending on a_first
-            if a_first:
-                b_hp = _fire_sequence(a_can, a_comp, b_shield, b_hp)
-                if b_hp <= 0:
-                    return 1
-                a_hp = _fire_sequence(b_can, b_comp, a_shield, a_hp)
-                if a_hp <= 0:
-                    return 0
-            else:
-                a_hp = _fire_sequence(b_can, b_comp, a_shield, a_hp)
-                if a_hp <= 0:
-                    return 0
-                b_hp = _fire_sequence(a_can, a_comp, b_shield, b_hp)
-                if b_hp <= 0:
-                    return 1
+            s_hp = _fire_sequence(f_can, f_comp, s_shield, s_hp, s)
+            if s_hp <= 0:
+                return 1
+            f_hp = _fire_sequence(s_can, s_comp, f_shield, f_hp, s)
+            if f_hp <= 0:
+                return 0
 
     @nb.njit(parallel=True, fastmath=True)
     def _batch_simulate(n,
                         a_init, a_hp, a_comp, a_shield,
-                        a_miss, a_can,
+                        a_miss, a_miss_n, a_can,
                         b_init, b_hp, b_comp, b_shield,
-                        b_miss, b_can) -> int:
+                        b_miss, b_miss_n, b_can,
+                        states) -> int:
+        """`states` holds one xoshiro256** state per `_CHUNK` trials."""
+        # initiative is trial-invariant: order the two sides once
+        a_first = a_init > b_init
+        if a_first:
+            f = (a_hp, a_comp, a_shield, a_miss, a_miss_n, a_can)
+            o = (b_hp, b_comp, b_shield, b_miss, b_miss_n, b_can)
+        else:
+            f = (b_hp, b_comp, b_shield, b_miss, b_miss_n, b_can)
+            o = (a_hp, a_comp, a_shield, a_miss, a_miss_n, a_can)
+        first_wins = 0
+        for c in nb.prange(states.shape[0]):
+            s = states[c]
+            local = 0
+            for _ in range(min(_CHUNK, n - c * _CHUNK)):
+                local += _first_wins(f[0], f[1], f[2], f[3], f[4], f[5],
+                                     o[0], o[1], o[2], o[3], o[4], o[5],
+                                     s)
+            first_wins += local
+        return first_wins if a_first else n - first_wins
+
+    def _chunk_states(n: int, seed: int | None):
+        """Independent xoshiro256** states, one per `_CHUNK` trials.
+
+        Children of one SeedSequence give independent streams, and the
+        result depends only on `seed`, not on how prange splits the work.
+        """
+        n_chunks = (n + _CHUNK - 1) // _CHUNK
+        children = np.random.SeedSequence(seed).spawn(n_chunks)
+        return np.array([ss.generate_state(4, np.uint64) for ss in children],
+                        dtype=np.uint64).reshape(n_chunks, 4)
+
+    @functools.lru_cache(maxsize=64)
+    def _group_missiles(missiles: tuple, dtype=np.int8):
+        """Distinct damage values (`dtype`) and their counts (int64).
+
+        Both are read-only.  Counts are never narrowed: the buffers are
+        tiny, and an int8 count would wrap past 127 same-damage missiles.
+        """
+        dmg, counts = np.unique(np.asarray(missiles, dtype=dtype),
+                                return_counts=True)
+        counts = counts.astype(np.int64)
+        dmg.flags.writeable = counts.flags.writeable = False
+        return dmg, counts
+
+    def _missile_arrs(missiles, dtype=np.int8):
+        """`_group_missiles` for a spec list; no missiles → shared empties."""
+        if not missiles:
+            return _EMPTY[dtype], _EMPTY[np.int64]
+        return _group_missiles(tuple(missiles), dtype)
+
+    def _kernel_dtype(spec_a, spec_b):
+        """int8 when every stat and damage value fits it, else int64.
+
+        Mirrors the dtype widening in `battle_sim._simulate_batch`, so
+        out-of-rules specs still simulate instead of overflowing.
+        """
+        values = [spec[k] for spec in (spec_a, spec_b)
+                  for k in ("initiative", "hull", "computer", "shield")]
+        values += [d for spec in (spec_a, spec_b)
+                   for k in ("missiles", "cannons") for d in spec[k]]
+        fits = all(-128 <= v <= 127 for v in values)
+        return np.int8 if fits else np.int64
+
+    # ── shape-specialised kernels ──────────────────────────────────────
+    _UNROLL_MAX = 8    # longest weapon list that gets a generated kernel
+    # A new shape costs a ~2s compile and saves ~0.1s per million trials,
+    # so smaller batches only use a kernel that is already built.
+    _UNROLL_MIN_SIMS = 20_000_000
+    _battle_fns = {}   # weapon shape → compiled kernel, never evicted
+
+    def _unrolled_source(f_miss, f_can, s_miss, s_can) -> str:
+        """Source of `first_wins` with every volley written out.
+
+        `*_miss` are ((dmg, count), …) missile groups, `*_can` cannon
+        damage tuples.  Cannon volleys roll every shot even when an early
+        one is already lethal, so seeded streams differ from
+        `_first_wins`, though the outcome distribution is the same.
+        """
+        lines = ["def first_wins(f_hp, f_mask, f_p, s_hp, s_mask, s_p, s):"]
+
+        def missiles(groups, p, hp, win, pad):
+            # no volley → only the hull check, so a wrecked side still loses
+            for dmg, k in groups:
+                lines.append(f"{pad}{hp} -= {dmg} * _binomial(s, {k}, {p})")
+            lines.append(f"{pad}if {hp} <= 0:")
+            lines.append(f"{pad}    return {win}")
+
+        def cannons(dmgs, mask, hp, win, pad):
+            # a volley only matters through its total, so every shot is
+            # evaluated branch-free and the hull is checked once at the end
+            if not dmgs:
+                return
+            terms = [f"(({mask} >> _roll(s)) & 1)" if dmg == 1 else
+                     f"{dmg} * (({mask} >> _roll(s)) & 1)" for dmg in dmgs]
+            lines.append(f"{pad}{hp} -= " + f" \\\n{pad}    + ".join(terms))
+            lines.append(f"{pad}if {hp} <= 0:")
+            lines.append(f"{pad}    return {win}")
+
+        missiles(f_miss, "f_p", "s_hp", 1, "    ")
+        missiles(s_miss, "s_p", "f_hp", 0, "    ")
+        lines.append("    while True:")
+        cannons(f_can, "f_mask", "s_hp", 1, "        ")
+        cannons(s_can, "s_mask", "f_hp", 0, "        ")
+        if not (f_can or s_can):
+            lines.append("        pass")
+        return "\n".join(lines) + "\n"
+
+    def _make_battle_fn(f_miss, f_can, s_miss, s_can):
+        """Compile a batch kernel specialised to these weapon lists.
+
+        The damage values become literals, so LLVM sees each volley as
+        straight-line code.  Memoised in `_battle_fns` on the (hashable)
+        weapon tuples; hulls, hit masks and probabilities stay runtime
+        arguments.
+        """
+        shape = (f_miss, f_can, s_miss, s_can)
+        if shape in _battle_fns:
+            return _battle_fns[shape]
+        namespace = {"_binomial": _binomial, "_roll": _roll}
+        exec(_unrolled_source(f_miss, f_can, s_miss, s_can), namespace)
+        first_wins = nb.njit(inline="always", fastmath=True)(
+            namespace["first_wins"])
+
+        @nb.njit(parallel=True, fastmath=True)
+        def batch(n, f_hp, f_mask, f_p, s_hp, s_mask, s_p, states):
+            wins = 0
+            for c in nb.prange(states.shape[0]):
+                s = states[c]
+                local = 0
+                for _ in range(min(_CHUNK, n - c * _CHUNK)):
+                    local += first_wins(f_hp, f_mask, f_p,
+                                        s_hp, s_mask, s_p, s)
+                wins += local
+            return wins
+
+        _battle_fns[shape] = batch
+        return batch
+
+    def _hit_figures(comp: int, shield: int):
+        """(hit mask, per-shot hit probability) as the kernels compute them."""
+        mask = _hit_mask(comp, shield)
+        return mask, bin(mask).count("1") / 6.0
+
+# ──────────────────────────────────────────────────────────────────────────
+# Internal helpers – CUDA version
+# ──────────────────────────────────────────────────────────────────────────
+
+if CUDA_AVAILABLE:
+    _GPU_MIN_SIMS = 1_000_000      # below this, launch overhead dominates
+    _GPU_BLOCK = 256
+    _GPU_MAX_THREADS = 1 << 20     # caps RNG-state memory; threads grid-stride
+
+    @cuda.jit(device=True, inline=True)
+    def _fire_gpu(dmg_arr, mask, enemy_hp, rng_states, tid):
+        for dmg in dmg_arr:
+            u = xoroshiro128p_uniform_float32(rng_states, tid)
+            r = min(int(u * 6), 5)       # float32 rounding can reach 6.0
+            if (mask >> r) & 1:
+                enemy_hp -= dmg
+                if enemy_hp <= 0:
+                    return enemy_hp
+        return enemy_hp
+
+    @cuda.jit(device=True)
+    def _first_wins_gpu(f_hp, f_mask, f_miss, f_can,
+                        s_hp, s_mask, s_miss, s_can, rng_states, tid):
+        """Same rules as `_first_wins`; 1 → first-firing side wins."""
+        s_hp = _fire_gpu(f_miss, f_mask, s_hp, rng_states, tid)
+        if s_hp <= 0:
+            return 1
+        f_hp = _fire_gpu(s_miss, s_mask, f_hp, rng_states, tid)
+        if f_hp <= 0:
+            return 0
+        while True:
+            s_hp = _fire_gpu(f_can, f_mask, s_hp, rng_states, tid)
+            if s_hp <= 0:
+                return 1
+            f_hp = _fire_gpu(s_can, s_mask, f_hp, rng_states, tid)
+            if f_hp <= 0:
+                return 0
+
+    @cuda.jit
+    def _battle_kernel(out, n,
+                       f_hp, f_mask, f_miss, f_can,
+                       s_hp, s_mask, s_miss, s_can, rng_states):
+        """out[tid] = first side's wins over trials tid, tid + stride, …"""
+        tid = cuda.grid(1)
+        if tid >= out.size:
+            return
         wins = 0
-        for _ in nb.prange(n):
-            wins += _battle_once(a_init, a_hp, a_comp, a_shield,
-                                 a_miss, a_can,
-                                 b_init, b_hp, b_comp, b_shield,
-                                 b_miss, b_can)
-        return wins
+        for _ in range(tid, n, cuda.gridsize(1)):
+            wins += _first_wins_gpu(f_hp, f_mask, f_miss, f_can,
+                                    s_hp, s_mask, s_miss, s_can,
+                                    rng_states, tid)
+        out[tid] = wins
+
+    _sum_reduce = cuda.reduce(lambda x, y: x + y)
+
+    def _gpu_simulate(n, spec_a, spec_b, seed: int) -> int:
+        """Run `n` duels on the GPU; return how many A wins."""
+        threads = min(n, _GPU_MAX_THREADS)
+        blocks = (threads + _GPU_BLOCK - 1) // _GPU_BLOCK
+        threads = blocks * _GPU_BLOCK
+        to_dev = lambda xs: cuda.to_device(_weapon_arr(xs, np.int32))
+        out = cuda.device_array(threads, dtype=np.int32)
+        rng_states = create_xoroshiro128p_states(threads, seed=seed)
+        a_first = spec_a["initiative"] > spec_b["initiative"]
+        first, second = (spec_a, spec_b) if a_first else (spec_b, spec_a)
+        _battle_kernel[blocks, _GPU_BLOCK](
+            out, n,
+            first["hull"], _hit_mask(first["computer"], second["shield"]),
+            to_dev(first["missiles"]), to_dev(first["cannons"]),
+            second["hull"], _hit_mask(second["computer"], first["shield"]),
+            to_dev(second["missiles"]), to_dev(second["cannons"]),
+            rng_states)
+        first_wins = int(_sum_reduce(out))
+        return first_wins if a_first else n - first_wins
 
 # ──────────────────────────────────────────────────────────────────────────
 # Pure-Python fallback  (≈ 8–10 × slower)
@@ -166,51 +474,36 @@ def _fire_sequence_py(damage_seq: Sequence[int],
                 return enemy_hp
     return enemy_hp
 
-def _battle_once_py(spec_a, spec_b) -> bool:
-    a_hp = spec_a["hull"]
-    b_hp = spec_b["hull"]
-    a_first = spec_a["initiative"] > spec_b["initiative"]
+def _first_wins_py(first: tuple, second: tuple) -> bool:
+    """One duel; True if the side firing first wins.
+
+    `first` / `second` are (hull, computer, shield, missiles, cannons).
+    """
+    f_hp, f_comp, f_shield, f_miss, f_can = first
+    s_hp, s_comp, s_shield, s_miss, s_can = second
 
-    # missile phase
-    if a_first:
-        b_hp = _fire_sequence_py(spec_a["missiles"], spec_a["computer"],
-                                 spec_b["shield"], b_hp)
-        if b_hp <= 0:
+    # missile phase (skipped if nobody has missiles)
+    if f_miss or s_miss:
+        s_hp = _fire_sequence_py(f_miss, f_comp, s_shield, s_hp)
+        if s_hp <= 0:
             return True
-        a_hp = _fire_sequence_py(spec_b["missiles"], spec_b["computer"],
-                                 spec_a["shield"], a_hp)
-        if a_hp <= 0:
+        f_hp = _fire_sequence_py(s_miss, s_comp, f_shield, f_hp)
+        if f_hp <= 0:
             return False
-    else:
-        a_hp = _fire_sequence_py(spec_b["missiles"], spec_b["computer"],
-                                 spec_a["shield"], a_hp)
-        if a_hp <= 0:
-            return False
-        b_hp = _fire_sequence_py(spec_a["missiles"], spec_a["computer"],
-                                 spec_b["shield"], b_hp)
-        if b_hp <= 0:
-            return True
+    # a side that starts wrecked never reaches its cannons
+    if s_hp <= 0:
+        return True
+    if f_hp <= 0:
+        return False
 
     # cannon phase
     while True:
-        if a_first:
-            b_hp = _fire_sequence_py(spec_a["cannons"], spec_a["computer"],
-                                     spec_b["shield"], b_hp)
-            if b_hp <= 0:
-                return True
-            a_hp = _fire_sequence_py(spec_b["cannons"], spec_b["computer"],
-                                     spec_a["shield"], a_hp)
-            if a_hp <= 0:
-                return False
-        else:
-            a_hp = _fire_sequence_py(spec_b["cannons"], spec_b["computer"],
-                                     spec_a["shield"], a_hp)
-            if a_hp <= 0:
-                return False
-            b_hp = _fire_sequence_py(spec_a["cannons"], spec_a["computer"],
-                                     spec_b["shield"], b_hp)
-            if b_hp <= 0:
-                return True
+        s_hp = _fire_sequence_py(f_can, f_comp, s_shield, s_hp)
+        if s_hp <= 0:
+            return True
+        f_hp = _fire_sequence_py(s_can, s_comp, f_shield, f_hp)
+        if f_hp <= 0:
+            return False
 
 # ──────────────────────────────────────────────────────────────────────────
 # Public function
@@ -236,33 +529,88 @@ def win_probability(spec_a: dict,
     -------
     float
     """
-    if seed is not None:
-        random.seed(seed)
-        if NUMBA_AVAILABLE:
-            np.random.seed(seed)
+    # Very large batches: one GPU thread per slice of trials
+    if CUDA_AVAILABLE and simulations >= _GPU_MIN_SIMS:
+        gpu_seed = random.getrandbits(64) if seed is None else seed & (2**64 - 1)
+        return _gpu_simulate(simulations, spec_a, spec_b, gpu_seed) / simulations
+
+    # Fastest CPU path: ahead-of-time compiled Cython core
+    if CYTHON_AVAILABLE:
+        seed64 = random.getrandbits(64) if seed is None else seed & (2**64 - 1)
+        wins = battle_sim_c.batch_simulate(
+            simulations,
+            spec_a["initiative"], spec_a["hull"],
+            spec_a["computer"],   spec_a["shield"],
+            _weapon_arr(spec_a["missiles"], np.int32),
+            _weapon_arr(spec_a["cannons"],  np.int32),
+            spec_b["initiative"], spec_b["hull"],
+            spec_b["computer"],   spec_b["shield"],
+            _weapon_arr(spec_b["missiles"], np.int32),
+            _weapon_arr(spec_b["cannons"],  np.int32),
+            seed64)
+        return wins / simulations
 
     # Fast path with Numba
     if NUMBA_AVAILABLE:
-        # Convert variable-length lists to 1-D numpy int32 arrays
-        a_miss = np.array(spec_a["missiles"], dtype=np.int32)
-        a_can  = np.array(spec_a["cannons"],   dtype=np.int32)
-        b_miss = np.array(spec_b["missiles"], dtype=np.int32)
-        b_can  = np.array(spec_b["cannons"],   dtype=np.int32)
+        states = _chunk_states(simulations, seed)
+
+        # Generated kernel for short lists, if this batch repays the
+        # compile or the shape has been compiled before
+        lists = (spec_a["missiles"], spec_a["cannons"],
+                 spec_b["missiles"], spec_b["cannons"])
+        a_first = spec_a["initiative"] > spec_b["initiative"]
+        first, second = (spec_a, spec_b) if a_first else (spec_b, spec_a)
+        shape = None
+        if max(map(len, lists)) <= _UNROLL_MAX:
+            groups = lambda spec: tuple(
+                zip(*map(np.ndarray.tolist,
+                         _missile_arrs(spec["missiles"], np.int64))))
+            shape = (groups(first), tuple(first["cannons"]),
+                     groups(second), tuple(second["cannons"]))
+        if shape is not None and (simulations >= _UNROLL_MIN_SIMS or
+                                  shape in _battle_fns):
+            batch = _make_battle_fn(*shape)
+            f_mask, f_p = _hit_figures(first["computer"], second["shield"])
+            s_mask, s_p = _hit_figures(second["computer"], first["shield"])
+            first_wins = batch(simulations, first["hull"], f_mask, f_p,
+                               second["hull"], s_mask, s_p, states)
+            wins = first_wins if a_first else simulations - first_wins
+            return wins / simulations
+
+        # Convert variable-length lists to 1-D numpy arrays (int8 unless a
+        # value needs more); missiles are grouped by damage value for the
+        # Binomial volley.
+        dt = _kernel_dtype(spec_a, spec_b)
+        a_miss, a_miss_n = _missile_arrs(spec_a["missiles"], dt)
+        a_can  = _weapon_arr(spec_a["cannons"], dt)
+        b_miss, b_miss_n = _missile_arrs(spec_b["missiles"], dt)
+        b_can  = _weapon_arr(spec_b["cannons"], dt)
 
         wins = _batch_simulate(simulations,
-                               spec_a["initiative"], spec_a["hull"],
-                               spec_a["computer"],   spec_a["shield"],
-                               a_miss, a_can,
-                               spec_b["initiative"], spec_b["hull"],
-                               spec_b["computer"],   spec_b["shield"],
-                               b_miss, b_can)
+                               dt(spec_a["initiative"]), dt(spec_a["hull"]),
+                               dt(spec_a["computer"]),   dt(spec_a["shield"]),
+                               a_miss, a_miss_n, a_can,
+                               dt(spec_b["initiative"]), dt(spec_b["hull"]),
+                               dt(spec_b["computer"]),   dt(spec_b["shield"]),
+                               b_miss, b_miss_n, b_can,
+                               states)
         return wins / simulations
 
     # Pure-Python fallback
-    wins = 0
+    if seed is not None:
+        random.seed(seed)
+
+    key = ("hull", "computer", "shield", "missiles", "cannons")
+    ship_a = tuple(spec_a[k] for k in key)
+    ship_b = tuple(spec_b[k] for k in key)
+    a_first = spec_a["initiative"] > spec_b["initiative"]
+    first, second = (ship_a, ship_b) if a_first else (ship_b, ship_a)
+
+    first_wins = 0
     for _ in range(simulations):
-        if _battle_once_py(spec_a, spec_b):
-            wins += 1
+        if _first_wins_py(first, second):
+            first_wins += 1
+    wins = first_wins if a_first else simulations - first_wins
     return wins / simulations
 
 
@@ -280,7 +628,8 @@ if __name__ == "__main__":
     t0 = time.perf_counter()
     p = win_probability(SHIP_A, SHIP_B, simulations=N, seed=42)
     dt = time.perf_counter() - t0
-    mode = "Numba" if NUMBA_AVAILABLE else "Pure-Python"
+    mode = ("Cython" if CYTHON_AVAILABLE
+            else "Numba" if NUMBA_AVAILABLE else "Pure-Python")
     print(f"{mode}:  P(A wins) ≈ {p:.4%}   ({N:_} sims in {dt:.2f}s)")
     if not NUMBA_AVAILABLE:
         print("\nTip:  pip / conda install numba  →  >20× speed-up on Apple silicon.")
@@ -0,0 +1,13 @@
+"""Build the optional Cython core:  python setup.py build_ext --inplace"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+ext = Extension(
+    "battle_sim_c",
+    ["battle_sim_c.pyx"],
+    extra_compile_args=["-O3", "-march=native", "-fopenmp"],
+    extra_link_args=["-fopenmp"],
+)
+
+setup(name="battle_sim_c", ext_modules=cythonize([ext]))
@@ -1,4 +1,8 @@
 import math
+import os
+import subprocess
+import sys
+import textwrap
 import pytest
 
 # ---------------------------------------------------------------------------
@@ -6,7 +10,11 @@ import pytest
 # For example, if your function lives in `battle_sim.py`, do:
 #     from battle_sim import win_probability
 # ---------------------------------------------------------------------------
+import battle_sim
+import battle_sim_numba
 from battle_sim_numba import win_probability   # <-- change if needed
+from battle_sim import exact_win_probability
+from battle_sim import win_probability as win_probability_batch
 
 # ---------------------------------------------------------------------------
 # Helper – keep the Monte‑Carlo run time sane but still accurate.
@@ -89,6 +97,246 @@ def test_win_probability(spec_a, spec_b, exact_p, _id):
         f"{_id}: estimate={est:.4%}, expected={exact_p:.4%}")
 
 
+@pytest.fixture
+def numba_generic(monkeypatch):
+    """Route `win_probability` to the generic Numba `_batch_simulate`."""
+    if not battle_sim_numba.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(battle_sim_numba, "CUDA_AVAILABLE", False)
+    monkeypatch.setattr(battle_sim_numba, "CYTHON_AVAILABLE", False)
+    monkeypatch.setattr(battle_sim_numba, "_UNROLL_MAX", -1)
+
+
+@pytest.fixture
+def numba_unrolled(monkeypatch):
+    """Route `win_probability` to the generated `_make_battle_fn` kernels."""
+    if not battle_sim_numba.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(battle_sim_numba, "CUDA_AVAILABLE", False)
+    monkeypatch.setattr(battle_sim_numba, "CYTHON_AVAILABLE", False)
+    monkeypatch.setattr(battle_sim_numba, "_UNROLL_MIN_SIMS", 0)
+
+
+@pytest.fixture
+def numba_pure(monkeypatch):
+    """Route `win_probability` to the pure-Python `_first_wins_py` loop."""
+    monkeypatch.setattr(battle_sim_numba, "CUDA_AVAILABLE", False)
+    monkeypatch.setattr(battle_sim_numba, "CYTHON_AVAILABLE", False)
+    monkeypatch.setattr(battle_sim_numba, "NUMBA_AVAILABLE", False)
+
+
+@pytest.mark.parametrize(
+    "spec_a, spec_b, exact_p, _id",
+    [(a, b, p, _id) for a, b, p, _id in TEST_CASES],
+    ids=[_id for *_rest, _id in TEST_CASES],
+)
+def test_win_probability_unrolled(numba_unrolled, spec_a, spec_b, exact_p, _id):
+    """Shape-specialised Numba kernels must agree with the exact value."""
+    est = win_probability(spec_a, spec_b, simulations=DEFAULT_SIMS, seed=123)
+    assert math.isclose(est, exact_p, rel_tol=REL_TOL), (
+        f"{_id}: estimate={est:.4%}, expected={exact_p:.4%}")
+
+
+def test_win_probability_long_weapon_lists(numba_generic):
+    """Lists longer than the unrolling threshold take the generic kernel."""
+    spec_a = {"initiative": 3, "hull": 6, "computer": 1, "shield": 0,
+              "missiles": [1] * 9, "cannons": [1] * 10}
+    spec_b = {"initiative": 2, "hull": 6, "computer": 1, "shield": 1,
+              "missiles": [1] * 10, "cannons": [1] * 12}
+    exact_p = exact_win_probability(spec_a, spec_b)
+    est = win_probability(spec_a, spec_b, simulations=DEFAULT_SIMS, seed=123)
+    assert math.isclose(est, exact_p, rel_tol=0.05), (
+        f"estimate={est:.4%}, expected={exact_p:.4%}")
+
+
+def test_win_probability_many_same_damage_missiles(numba_generic):
+    """Missile counts and damage values above 127 must not wrap."""
+    spec_a = {"initiative": 3, "hull": 6, "computer": 1, "shield": 0,
+              "missiles": [1] * 200, "cannons": [1] * 10}
+    spec_b = {"initiative": 2, "hull": 33, "computer": 1, "shield": 1,
+              "missiles": [1] * 10, "cannons": [200] * 2}
+    exact_p = exact_win_probability(spec_a, spec_b)
+    est = win_probability(spec_a, spec_b, simulations=DEFAULT_SIMS, seed=123)
+    assert math.isclose(est, exact_p, rel_tol=REL_TOL), (
+        f"estimate={est:.4%}, expected={exact_p:.4%}")
+
+
+@pytest.mark.parametrize(
+    "spec_a, spec_b, exact_p, _id",
+    [(a, b, p, _id) for a, b, p, _id in TEST_CASES],
+    ids=[_id for *_rest, _id in TEST_CASES],
+)
+def test_win_probability_batch(spec_a, spec_b, exact_p, _id):
+    """Vectorised NumPy simulator in `battle_sim` must agree as well."""
+    est = win_probability_batch(spec_a, spec_b, simulations=DEFAULT_SIMS,
+                                seed=123, exact=False)
+    assert math.isclose(est, exact_p, rel_tol=REL_TOL), (
+        f"{_id}: estimate={est:.4%}, expected={exact_p:.4%}")
+
+
+def test_win_probability_batch_binomial_volleys():
+    """Eight or more equal-damage shots are drawn as one Binomial."""
+    spec_a = {"initiative": 3, "hull": 10, "computer": 1, "shield": 0,
+              "missiles": [1] * 9, "cannons": [1] * 10}
+    spec_b = {"initiative": 2, "hull": 6, "computer": 1, "shield": 1,
+              "missiles": [1] * 8, "cannons": [1] * 10}
+    exact_p = exact_win_probability(spec_a, spec_b)
+    est = win_probability_batch(spec_a, spec_b, simulations=DEFAULT_SIMS,
+                                seed=123, exact=False)
+    assert math.isclose(est, exact_p, rel_tol=REL_TOL), (
+        f"estimate={est:.4%}, expected={exact_p:.4%}")
+
+
+def test_win_probability_batch_wide_volleys():
+    """Hulls and volleys beyond int16 widen the hull arrays further."""
+    spec_a = {"initiative": 3, "hull": 40_000, "computer": 1, "shield": 0,
+              "missiles": [], "cannons": [20_000] * 2}
+    spec_b = {"initiative": 2, "hull": 40_000, "computer": 1, "shield": 1,
+              "missiles": [], "cannons": [40_000]}
+    # dividing every hull and damage by 20 000 leaves the odds unchanged
+    small = lambda spec: dict(spec, hull=spec["hull"] // 20_000,
+                              cannons=[d // 20_000 for d in spec["cannons"]])
+    exact_p = exact_win_probability(small(spec_a), small(spec_b))
+    est = win_probability_batch(spec_a, spec_b, simulations=DEFAULT_SIMS,
+                                seed=123, exact=False)
+    assert math.isclose(est, exact_p, rel_tol=REL_TOL), (
+        f"estimate={est:.4%}, expected={exact_p:.4%}")
+
+
+# A side that starts with no hull left loses before it fires a shot.
+WRECKED_CASES = [
+    (
+        {"initiative": 5, "hull": 0, "computer": 3, "shield": 0,
+         "missiles": [], "cannons": [3]},
+        {"initiative": 4, "hull": 2, "computer": 0, "shield": 0,
+         "missiles": [], "cannons": [1]},
+        0.0,
+        "wrecked_first_cannons",
+    ),
+    (
+        {"initiative": 5, "hull": 2, "computer": 0, "shield": 0,
+         "missiles": [], "cannons": [1]},
+        {"initiative": 4, "hull": 0, "computer": 3, "shield": 0,
+         "missiles": [3], "cannons": []},
+        1.0,
+        "wrecked_second_missiles",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "spec_a, spec_b, exact_p, _id", WRECKED_CASES,
+    ids=[_id for *_rest, _id in WRECKED_CASES],
+)
+def test_win_probability_pure_wrecked_hull(monkeypatch, spec_a, spec_b,
+                                           exact_p, _id):
+    """A ship with no hull left never fires, on any `battle_sim` engine."""
+    assert exact_win_probability(spec_a, spec_b) == exact_p
+    assert win_probability_batch(spec_a, spec_b, simulations=10_000,
+                                 seed=123, exact=False) == exact_p
+    monkeypatch.setattr(battle_sim, "NUMPY_AVAILABLE", False)
+    assert win_probability_batch(spec_a, spec_b, simulations=10_000,
+                                 seed=123, exact=False) == exact_p
+
+
+def test_win_probability_pure_process_pool(monkeypatch):
+    """Pure-Python runs fanned out over workers are seeded and accurate."""
+    spec_a, spec_b, exact_p, _id = TEST_CASES[3]
+    monkeypatch.setattr(battle_sim, "NUMPY_AVAILABLE", False)
+    monkeypatch.setattr(battle_sim, "_PARALLEL_MIN_SIMS", 1)
+    monkeypatch.setattr(battle_sim.os, "cpu_count", lambda: 2)
+    run = lambda: win_probability_batch(spec_a, spec_b, simulations=20_000,
+                                        seed=7, exact=False)
+    est = run()
+    assert est == run()
+    assert math.isclose(est, exact_win_probability(spec_a, spec_b),
+                        rel_tol=REL_TOL), (
+        f"{_id}: estimate={est:.4%}, expected={exact_p:.4%}")
+
+
+def test_win_probability_both_wrecked_is_draw(monkeypatch):
+    """Two ships with no hull left draw, and a draw is not a win for A."""
+    spec_a = {"initiative": 5, "hull": 0, "computer": 3, "shield": 0,
+              "missiles": [1], "cannons": [3]}
+    spec_b = {"initiative": 4, "hull": 0, "computer": 0, "shield": 0,
+              "missiles": [], "cannons": [1]}
+    assert exact_win_probability(spec_a, spec_b) == 0.0
+    assert win_probability_batch(spec_a, spec_b) == 0.0
+    assert win_probability_batch(spec_a, spec_b, simulations=10_000,
+                                 seed=123, exact=False) == 0.0
+    monkeypatch.setattr(battle_sim, "NUMPY_AVAILABLE", False)
+    assert win_probability_batch(spec_a, spec_b, simulations=10_000,
+                                 seed=123, exact=False) == 0.0
+
+
+@pytest.mark.parametrize("engine",
+                         ["numba_generic", "numba_unrolled", "numba_pure"])
+@pytest.mark.parametrize(
+    "spec_a, spec_b, exact_p, _id", WRECKED_CASES,
+    ids=[_id for *_rest, _id in WRECKED_CASES],
+)
+def test_win_probability_numba_wrecked_hull(request, engine, spec_a, spec_b,
+                                            exact_p, _id):
+    """Same for every `battle_sim_numba` engine."""
+    request.getfixturevalue(engine)
+    est = win_probability(spec_a, spec_b, simulations=10_000, seed=123)
+    assert est == exact_p, f"{_id}: estimate={est:.4%}, expected={exact_p:.4%}"
+
+
+@pytest.mark.parametrize(
+    "spec_a, spec_b, exact_p, _id",
+    [(a, b, p, _id) for a, b, p, _id in TEST_CASES],
+    ids=[_id for *_rest, _id in TEST_CASES],
+)
+def test_exact_win_probability(spec_a, spec_b, exact_p, _id):
+    """DP solver reproduces the analytical value up to float rounding."""
+    assert math.isclose(exact_win_probability(spec_a, spec_b), exact_p,
+                        rel_tol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "spec_a, spec_b, exact_p, _id",
+    [(a, b, p, _id) for a, b, p, _id in TEST_CASES],
+    ids=[_id for *_rest, _id in TEST_CASES],
+)
+def test_win_probability_cython(spec_a, spec_b, exact_p, _id):
+    """Compiled core (only when built in place) must agree as well."""
+    np = pytest.importorskip("numpy")
+    battle_sim_c = pytest.importorskip("battle_sim_c")
+    arr = lambda xs: np.array(xs, dtype=np.int32)
+    wins = battle_sim_c.batch_simulate(
+        DEFAULT_SIMS,
+        spec_a["initiative"], spec_a["hull"], spec_a["computer"], spec_a["shield"],
+        arr(spec_a["missiles"]), arr(spec_a["cannons"]),
+        spec_b["initiative"], spec_b["hull"], spec_b["computer"], spec_b["shield"],
+        arr(spec_b["missiles"]), arr(spec_b["cannons"]),
+        123)
+    est = wins / DEFAULT_SIMS
+    assert math.isclose(est, exact_p, rel_tol=REL_TOL), (
+        f"{_id}: estimate={est:.4%}, expected={exact_p:.4%}")
+
+
+def test_gpu_simulate_cudasim():
+    """CUDA kernel on Numba's simulator, which must be on before import."""
+    pytest.importorskip("numba")
+    spec_a, spec_b, exact_p, _id = TEST_CASES[0]
+    script = textwrap.dedent(f"""
+        import battle_sim_numba as m
+        a, b, n = {spec_a!r}, {spec_b!r}, 1000
+        m._GPU_MIN_SIMS = 1
+        print(m._gpu_simulate(n, a, b, 2**64 - 1) / n,
+              m.win_probability(a, b, simulations=n, seed=-1))
+    """)
+    env = dict(os.environ, NUMBA_ENABLE_CUDASIM="1")
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", script],
+                         env=env, capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    est, masked = map(float, out.stdout.split())
+    assert masked == est                     # seed=-1 wraps to 2**64 - 1
+    assert math.isclose(est, exact_p, rel_tol=0.1), (
+        f"{_id}: estimate={est:.4%}, expected={exact_p:.4%}")
+
+
 # ---------------------------------------------------------------------------
 # Optional: mark a *slow* test that runs 1 000 000 sims to catch regressions
 # in performance as well as accuracy.  Disabled by default (need -m slow).